@@ -4,25 +4,38 @@ import json
 import sys
 import warnings
 import os
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 
 # Suppress openpyxl ZipFile cleanup warning (harmless, known issue with Python 3.13)
 warnings.filterwarnings('ignore', category=UserWarning, module='openpyxl')
 
 FILE_PATH = "resource/EP_api_assignment_nes.xlsx"
 OUTPUT_HTML = "results/ep_matrix.html"
+OUTPUT_TXT = "results/testcase.txt"
+
+# Watch mode (--watch / --serve)
+WATCH_INTERVAL = 0.2    # Seconds between workbook polls
+WATCH_DEBOUNCE = 0.3    # Workbook must be unchanged this long before reparse
+LIVE_RELOAD_PORT = 8765
 
 # =========================================================
 # STEP 1: Read conditions from Excel
 # =========================================================
-def read_conditions(path, sheet_name=None):
+def read_conditions(path, sheet_name=None, read_only=False):
     """
     Read conditions from Excel file.
     
     Args:
         path: Path to Excel file
         sheet_name: Name of sheet to read (None = active sheet)
+        read_only: Parse only the requested sheet lazily (used by watch mode)
     """
-    wb = load_workbook(path, data_only=True, keep_vba=True)
+    if read_only:
+        wb = load_workbook(path, data_only=True, read_only=True)
+    else:
+        wb = load_workbook(path, data_only=True, keep_vba=True)
     
     # Use specified sheet or active sheet
     if sheet_name:
@@ -33,7 +46,7 @@ def read_conditions(path, sheet_name=None):
     conditions = OrderedDict()
     last_condition = None
 
-    for row in ws.iter_rows(min_row=2):
+    for row in ws.iter_rows(min_row=2, max_col=5):
         cond = row[0].value
         v_desc = row[1].value
         v_tag = row[2].value
@@ -58,6 +71,10 @@ def read_conditions(path, sheet_name=None):
         if isinstance(x_tag, str):
             conditions[last_condition]["invalid"][x_tag] = x_desc
 
+    if read_only:
+        # Release the file handle so Excel can keep saving
+        wb.close()
+
     return conditions
 
 
@@ -66,10 +83,20 @@ def read_conditions(path, sheet_name=None):
 # =========================================================
 def generate_ep_testcases(conditions):
     conds = list(conditions.keys())
+    if not conds:
+        return []
 
     valid_sets = [list(conditions[c]["valid"].keys()) for c in conds]
     invalid_sets = [list(conditions[c]["invalid"].keys()) for c in conds]
 
+    # Every condition needs at least one valid partition to act as the base
+    # value when another condition is being tested with an invalid tag
+    missing = [c for c, vs in zip(conds, valid_sets) if not vs]
+    if missing:
+        raise ValueError(
+            f"Condition(s) without valid partition: {', '.join(missing)}"
+        )
+
     tcs = []
 
     # -----------------------------------------------------
@@ -140,7 +167,7 @@ def build_matrix(conditions, tcs):
 # =========================================================
 # STEP 5: Generate HTML Matrix + TC Detail Panel
 # =========================================================
-def generate_html(matrix, tag_to_cond, tc_count, tcs, conditions):
+def generate_html(matrix, tag_to_cond, tc_count, tcs, conditions, live_reload=False):
     conds = list(conditions.keys())
 
     tc_detail = OrderedDict()
@@ -161,6 +188,21 @@ def generate_html(matrix, tag_to_cond, tc_count, tcs, conditions):
 
     tc_detail_json = json.dumps(tc_detail, ensure_ascii=False)
 
+    # Poll the live-reload server and refresh when outputs are regenerated
+    live_reload_script = ""
+    if live_reload:
+        live_reload_script = """
+<script>
+let epVersion = null;
+setInterval(() => {
+  fetch("/__version").then(r => r.text()).then(v => {
+    if (epVersion !== null && v !== epVersion) location.reload();
+    epVersion = v;
+  }).catch(() => {});
+}, 500);
+</script>
+"""
+
     html = f"""
 <!DOCTYPE html>
 <html>
@@ -344,6 +386,7 @@ function escapeHtml(text) {{
     .replace(/>/g, '&gt;');
 }}
 </script>
+{live_reload_script}
 </head>
 
 <body>
@@ -385,10 +428,150 @@ function escapeHtml(text) {{
     return html
 
 
+# =========================================================
+# STEP 6: Write Outputs (testcase.txt + HTML)
+# =========================================================
+def write_outputs(conditions, verbose=True, live_reload=False):
+    tcs = generate_ep_testcases(conditions)
+
+    # Write testcases to text file
+    with open(OUTPUT_TXT, "w", encoding="utf-8") as f:
+        conds = list(conditions.keys())
+        for i, tc in enumerate(tcs, start=1):
+            if i > 1: f.write("\n")
+            f.write(f"TC{i}\n")
+            for idx, tag in enumerate(tc):
+                cond = conds[idx]
+                desc = conditions[cond]["valid"].get(tag) or conditions[cond]["invalid"].get(tag) or ""
+                f.write(f"  - {cond}: {tag} = {desc}\n")
+
+    # terminal output (unchanged)
+    if verbose:
+        print_testcases(tcs, conditions)
+
+    matrix, tag_to_cond = build_matrix(conditions, tcs)
+    html = generate_html(matrix, tag_to_cond, len(tcs), tcs, conditions, live_reload)
+
+    with open(OUTPUT_HTML, "w", encoding="utf-8") as f:
+        f.write(html)
+
+    return tcs
+
+
+# =========================================================
+# STEP 7: Watch Mode + Live Reload Server
+# =========================================================
+class LiveReloadHandler(SimpleHTTPRequestHandler):
+    """
+    Serve the results folder; /__version changes after each regeneration.
+    """
+    version = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=os.path.dirname(OUTPUT_HTML) or ".", **kwargs)
+
+    def do_GET(self):
+        if self.path == "/__version":
+            body = str(LiveReloadHandler.version).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Cache-Control", "no-store")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_live_reload_server(port=LIVE_RELOAD_PORT):
+    try:
+        server = ThreadingHTTPServer(("127.0.0.1", port), LiveReloadHandler)
+    except OSError as e:
+        print(f"[LIVE] Error: cannot start server on port {port}: {e}")
+        return None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    page = os.path.basename(OUTPUT_HTML)
+    print(f"[LIVE] Serving http://127.0.0.1:{port}/{page}")
+    return server
+
+
+def file_snapshot(path):
+    try:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        # Excel replaces the file on save, it can be briefly missing
+        return None
+
+
+def watch_workbook(path, sheet_name, conditions, live_reload=False, stop_event=None):
+    """
+    Poll the workbook and regenerate outputs when the selected sheet changes.
+    Excel's "~$" lock files are never looked at; a change is only handled
+    once the workbook has been stable for WATCH_DEBOUNCE seconds.
+    Runs until Ctrl+C, or until stop_event (threading.Event) is set.
+    """
+    print(f"\n[WATCH] Watching {path} (sheet: {sheet_name}). Press Ctrl+C to stop.")
+    last = file_snapshot(path)
+
+    while not (stop_event and stop_event.is_set()):
+        time.sleep(WATCH_INTERVAL)
+        current = file_snapshot(path)
+        if current is None or current == last:
+            continue
+
+        # Debounce: wait until the save is finished
+        stable_since = time.monotonic()
+        while time.monotonic() - stable_since < WATCH_DEBOUNCE:
+            time.sleep(WATCH_INTERVAL)
+            snap = file_snapshot(path)
+            if snap != current:
+                current = snap
+                stable_since = time.monotonic()
+        if current is None:
+            continue
+        last = current
+
+        started = time.perf_counter()
+        try:
+            new_conditions = read_conditions(path, sheet_name, read_only=True)
+        except Exception as e:
+            # Missing sheet or half-written workbook: wait for the next save
+            print(f"[WATCH] Cannot read sheet '{sheet_name}': {e} (waiting for next save)")
+            continue
+
+        if new_conditions == conditions:
+            continue
+        conditions = new_conditions
+
+        try:
+            tcs = write_outputs(conditions, verbose=False, live_reload=live_reload)
+        except ValueError as e:
+            print(f"[WATCH] Error: {e}")
+            continue
+
+        LiveReloadHandler.version += 1
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"[WATCH] Regenerated {len(tcs)} TC in {elapsed:.0f} ms")
+
+
 # =========================================================
 # MAIN
 # =========================================================
 if __name__ == "__main__":
+    # Flags: --watch regenerates on save, --serve also starts live reload
+    serve = "--serve" in sys.argv
+    watch = serve or "--watch" in sys.argv
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    unknown = [a for a in sys.argv[1:] if a.startswith("--") and a not in ("--watch", "--serve")]
+    if unknown:
+        print(f"Error: Unknown option(s): {', '.join(unknown)}")
+        print("Available options: --watch, --serve")
+        sys.exit(1)
+
     # Load workbook to check sheets
     wb = load_workbook(FILE_PATH, data_only=True, keep_vba=True)
     sheet_names = wb.sheetnames
@@ -402,9 +585,9 @@ if __name__ == "__main__":
     
     # If multiple sheets, check command line argument or prompt user
     else:
-        if len(sys.argv) > 1:
+        if args:
             # Sheet name provided as command line argument
-            selected_sheet = sys.argv[1]
+            selected_sheet = args[0]
             if selected_sheet not in sheet_names:
                 print(f"Error: Sheet '{selected_sheet}' not found.")
                 print(f"Available sheets: {', '.join(sheet_names)}")
@@ -439,31 +622,25 @@ if __name__ == "__main__":
     
     print(f"\nProcessing sheet: {selected_sheet}\n")
     
+    if serve and start_live_reload_server() is None:
+        sys.exit(1)
+
     # Read conditions from selected sheet
     conditions = read_conditions(FILE_PATH, selected_sheet)
-    tcs = generate_ep_testcases(conditions)
+    try:
+        write_outputs(conditions, live_reload=serve)
+        print(f"\n[OK] EP Matrix generated → {OUTPUT_HTML}")
+    except ValueError as e:
+        print(f"Error: {e}")
+        # Keep watching a sheet that is still being written
+        if not watch:
+            sys.exit(1)
+
+    if watch:
+        try:
+            watch_workbook(FILE_PATH, selected_sheet, conditions, live_reload=serve)
+        except KeyboardInterrupt:
+            print("\nStopped watching.")
 
-    # Write testcases to text file
-    with open("results/testcase.txt", "w", encoding="utf-8") as f:
-        conds = list(conditions.keys())
-        for i, tc in enumerate(tcs, start=1):
-            if i > 1: f.write("\n")
-            f.write(f"TC{i}\n")
-            for idx, tag in enumerate(tc):
-                cond = conds[idx]
-                desc = conditions[cond]["valid"].get(tag) or conditions[cond]["invalid"].get(tag) or ""
-                f.write(f"  - {cond}: {tag} = {desc}\n")
-
-    # terminal output (unchanged)
-    print_testcases(tcs, conditions)
-
-    matrix, tag_to_cond = build_matrix(conditions, tcs)
-    html = generate_html(matrix, tag_to_cond, len(tcs), tcs, conditions)
-
-    with open(OUTPUT_HTML, "w", encoding="utf-8") as f:
-        f.write(html)
-
-    print(f"\n[OK] EP Matrix generated → {OUTPUT_HTML}")
-    
     # Suppress harmless openpyxl ZipFile cleanup warning during exit
     sys.stderr = open(os.devnull, 'w')
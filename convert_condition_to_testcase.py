@@ -1,8 +1,10 @@
 import os
+import re
 import sys
 import io
+import time
 import pandas as pd
-from openai import OpenAI
+from openai import APIError, OpenAI
 from dotenv import load_dotenv
 from openpyxl import load_workbook
 from openpyxl.styles import Alignment
@@ -20,6 +22,34 @@ AGENDA_FILE = "agend.md"
 REQUIREMENT_FILE = "resource/requirement.md"
 OUTPUT_FILE = "results/testcase.xlsx"
 MODEL_NAME = "gpt-4.1"
+FAST_MODEL_NAME = "gpt-4.1-mini"
+
+# OpenAI-compatible local endpoint (e.g. Ollama, vLLM, LM Studio)
+LOCAL_BASE_URL = os.environ.get("LOCAL_LLM_BASE_URL", "http://localhost:11434/v1")
+LOCAL_MODEL_NAME = os.environ.get("LOCAL_LLM_MODEL", "llama3.1")
+
+# Backend used for each TC kind: "openai", "openai-fast", "local" or "template"
+#   valid   -> TC with valid partitions only
+#   invalid -> TC with a single invalid partition
+ROUTING = {
+    "valid": "openai",
+    "invalid": "openai-fast",
+}
+BATCH_SIZE = 20
+
+# Template backend: renders invalid TCs without AI from explicit values.
+# Every condition used by a templated TC needs a field and a value per tag.
+TEMPLATE_METHOD = "POST"
+TEMPLATE_ENDPOINT = ""  # e.g. "/api/register"
+TEMPLATE_EXPECTED_RESULT = "API returns 400 Bad Request with validation error message for {field}"
+TEMPLATE_FIELDS = {
+    # "Email uniqueness": {
+    #     "field": "email",
+    #     "values": {"v1": "alice@test.com", "x1": "bob@test.com"},
+    # },
+}
+
+HTTP_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE")
 
 EXPECTED_COLUMNS = [
     "TC ID",
@@ -143,20 +173,269 @@ def post_process_excel(file_path: str):
 
     wb.save(file_path)
 
+def parse_testcases(content: str) -> list:
+    """
+    Split testcase.txt content into TC blocks.
+    Each block: {"id": "TC1", "text": raw block, "items": [(cond, tag, desc), ...]}
+
+    Blocks start at "TCn" header lines. Descriptions are written as-is from
+    Excel, so lines that are not "  - cond: tag = desc" items (including
+    blank lines from Alt+Enter) continue the previous description.
+    """
+    header_pattern = re.compile(r"^TC\d+$")
+    item_pattern = re.compile(r"^\s+-\s(.+?):\s+(\S+)\s+=\s?(.*)$")
+    blocks = []
+
+    for line in content.splitlines():
+        if header_pattern.match(line.strip()):
+            blocks.append({"id": line.strip(), "lines": [line.strip()], "items": []})
+            continue
+        if not blocks:
+            continue
+
+        block = blocks[-1]
+        block["lines"].append(line)
+        match = item_pattern.match(line)
+        if match:
+            block["items"].append(list(match.groups()))
+        elif block["items"]:
+            block["items"][-1][2] += "\n" + line
+
+    for block in blocks:
+        block["text"] = "\n".join(block.pop("lines")).strip()
+        block["items"] = [(c, t, d.strip()) for c, t, d in block["items"]]
+
+    return blocks
+
+
+def classify_testcase(block: dict) -> str:
+    """
+    A TC is valid if all its tags start with 'v', invalid otherwise
+    (same rule as the EP matrix header colors).
+    """
+    if all(tag.lower().startswith("v") for _, tag, _ in block["items"]):
+        return "valid"
+    return "invalid"
+
+
+def route_testcases(blocks: list) -> dict:
+    """
+    Group TC blocks by backend name from ROUTING, keeping input order.
+    """
+    routed = {}
+    for block in blocks:
+        routed.setdefault(ROUTING[classify_testcase(block)], []).append(block)
+    return routed
+
+
+def parse_ai_output(ai_output: str) -> pd.DataFrame:
+    """
+    Convert tab-separated AI output (with or without header) to DataFrame.
+    """
+    cleaned_output = clean_ai_output(ai_output)
+    lines = cleaned_output.splitlines()
+    first_row = lines[0].split("\t")
+
+    if first_row == EXPECTED_COLUMNS:
+        return pd.read_csv(io.StringIO(cleaned_output), sep="\t")
+
+    return pd.read_csv(
+        io.StringIO(cleaned_output),
+        sep="\t",
+        header=None,
+        names=EXPECTED_COLUMNS
+    )
+
+
+def validate_agenda_format(df: pd.DataFrame):
+    """
+    Check rows against the agenda format rules (agend.md 7-9):
+    - Test Data: lowercase "key: value" pairs with explicit values
+    - Test Steps: start with HTTP method and endpoint, no "with test data"
+    - Expected Result: includes HTTP status code
+    Expects raw rows, before normalize_multiline_columns.
+    """
+    data_pattern = re.compile(r"^[a-z0-9_.]+: \S.*$")
+    step_pattern = re.compile(rf"^1\. Send ({'|'.join(HTTP_METHODS)}) request to /\S*")
+
+    for idx, row in df.iterrows():
+        tc_id = row["TC ID"]
+
+        for pair in str(row["Test Data"]).split(" | "):
+            value = pair.split(": ", 1)[-1]
+            if not data_pattern.match(pair) or re.fullmatch(r"<.*>", value):
+                raise ValueError(f"Test Data breaks agenda format in {tc_id}: {pair}")
+
+        steps = str(row["Test Steps"])
+        if not step_pattern.match(steps):
+            raise ValueError(f"Test Steps missing HTTP method and endpoint in {tc_id}: {steps}")
+        if "with test data" in steps.lower():
+            raise ValueError(f"Test Steps must reference actual values in {tc_id}: {steps}")
+
+        if not re.search(r"\b[1-5]\d\d\b", str(row["Expected Result"])):
+            raise ValueError(f"Expected Result missing HTTP status code in {tc_id}")
+
+
+def match_rows_to_blocks(df: pd.DataFrame, blocks: list) -> pd.DataFrame:
+    """
+    Match AI rows to input TC blocks by the echoed "TCn" ID instead of
+    row position. Returns rows in block order with TC ID set to the block ID.
+    """
+    expected = [b["id"] for b in blocks]
+    rows = {}
+
+    for _, row in df.iterrows():
+        match = re.fullmatch(r"TC-?0*(\d+)", str(row["TC ID"]).strip())
+        tc_id = f"TC{match.group(1)}" if match else str(row["TC ID"]).strip()
+        if tc_id not in expected:
+            raise ValueError(f"Unexpected TC ID in AI output: {row['TC ID']}")
+        if tc_id in rows:
+            raise ValueError(f"Duplicate TC ID in AI output: {row['TC ID']}")
+        rows[tc_id] = row
+
+    missing = [tc_id for tc_id in expected if tc_id not in rows]
+    if missing:
+        raise ValueError(f"Missing test cases in AI output: {', '.join(missing)}")
+
+    df = pd.DataFrame([rows[tc_id] for tc_id in expected], columns=EXPECTED_COLUMNS)
+    df["TC ID"] = expected
+    return df.reset_index(drop=True)
+
+
 # ---------------------------
-# Main Process
+# Conversion Backends
 # ---------------------------
 
-def main():
-    # 1. Check API Key
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key:
-        print("❌ OPENAI_API_KEY not set.")
-        sys.exit(1)
+class OpenAIBackend:
+    """
+    Chat completion backend. Also serves OpenAI-compatible local
+    endpoints when base_url is given.
+    """
+
+    def __init__(self, name: str, model: str, api_key: str, base_url: str = None):
+        self.name = name
+        self.model = model
+        self.client = OpenAI(api_key=api_key, base_url=base_url)
+
+    def convert(self, blocks: list, system_content: str) -> pd.DataFrame:
+        testcase_content = "\n\n".join(b["text"] for b in blocks)
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_content},
+                {"role": "user", "content": testcase_content}
+            ],
+            temperature=0.1
+        )
+        ai_output = response.choices[0].message.content
 
-    client = OpenAI(api_key=api_key)
+        try:
+            df = match_rows_to_blocks(parse_ai_output(ai_output), blocks)
+        except Exception:
+            print("\n--- RAW AI OUTPUT ---\n")
+            print(clean_ai_output(ai_output))
+            raise
+
+        return df
+
+
+class TemplateBackend:
+    """
+    Deterministic backend for invalid-partition TCs. Renders rows from
+    TEMPLATE_METHOD, TEMPLATE_ENDPOINT and the explicit values in
+    TEMPLATE_FIELDS without calling any model.
+    """
+
+    name = "template"
+    model = "-"
+
+    def convert(self, blocks: list, system_content: str) -> pd.DataFrame:
+        rows = []
+        for block in blocks:
+            invalid = [i for i in block["items"] if not i[1].lower().startswith("v")]
+            if len(invalid) != 1:
+                raise ValueError(
+                    f"Template backend supports single-invalid TCs only: {block['id']}"
+                )
+            invalid_cond, _, invalid_desc = invalid[0]
+
+            # Several conditions may target the same field; the invalid value wins
+            test_data = {}
+            for cond, tag, _ in block["items"]:
+                field_config = TEMPLATE_FIELDS.get(cond)
+                if not field_config or tag not in field_config["values"]:
+                    raise ValueError(
+                        f"TEMPLATE_FIELDS has no value for '{cond}' tag '{tag}' ({block['id']})"
+                    )
+                field = field_config["field"]
+                if cond == invalid_cond or field not in test_data:
+                    test_data[field] = field_config["values"][tag]
+
+            field = TEMPLATE_FIELDS[invalid_cond]["field"]
+            desc = " ".join(invalid_desc.split())
+            request = f"{TEMPLATE_METHOD} request to {TEMPLATE_ENDPOINT}"
+            values = " and ".join(f"{k}={v}" for k, v in test_data.items())
+
+            rows.append({
+                "TC ID": block["id"],
+                "Test Case Name": f"{TEMPLATE_METHOD} {TEMPLATE_ENDPOINT} fails when {field} is invalid ({desc})",
+                "Test Objective": f"To ensure the API rejects the request when {field} is invalid ({desc})",
+                "Prepare Step": "",
+                "Test Data": " | ".join(f"{k}: {v}" for k, v in test_data.items()),
+                "Test Steps": f"1. Send {request} with {values} | 2. Receive API response",
+                "Expected Result": TEMPLATE_EXPECTED_RESULT.format(field=field),
+            })
+
+        df = pd.DataFrame(rows, columns=EXPECTED_COLUMNS)
+        validate_agenda_format(df)
+        return df
+
+
+def create_backend(kind: str):
+    """
+    Build a backend by routing name.
+    """
+    if kind == "template":
+        if TEMPLATE_METHOD not in HTTP_METHODS or not TEMPLATE_ENDPOINT.startswith("/"):
+            print("❌ Template backend needs TEMPLATE_METHOD and TEMPLATE_ENDPOINT (e.g. POST /api/register).")
+            sys.exit(1)
+        return TemplateBackend()
 
-    # 2. Check input files
+    if kind == "local":
+        # Local servers usually ignore the key, but the client requires one
+        api_key = os.environ.get("LOCAL_LLM_API_KEY", "local")
+        return OpenAIBackend("local", LOCAL_MODEL_NAME, api_key, LOCAL_BASE_URL)
+
+    if kind in ("openai", "openai-fast"):
+        api_key = os.environ.get("OPENAI_API_KEY")
+        if not api_key:
+            print("❌ OPENAI_API_KEY not set.")
+            sys.exit(1)
+        model = MODEL_NAME if kind == "openai" else FAST_MODEL_NAME
+        return OpenAIBackend(kind, model, api_key)
+
+    raise ValueError(f"Unknown backend: {kind}")
+
+
+def print_backend_stats(stats: dict):
+    """
+    Print per-backend throughput and latency.
+    """
+    print("\n📊 Backend stats:")
+    for name, s in stats.items():
+        avg_latency = s["seconds"] / s["calls"] if s["calls"] else 0
+        throughput = s["testcases"] / s["seconds"] if s["seconds"] else 0
+        print(
+            f"  - {name} ({s['model']}): {s['testcases']} TC in {s['calls']} call(s), "
+            f"avg latency {avg_latency:.2f}s, {throughput:.1f} TC/s"
+        )
+
+# ---------------------------
+# Main Process
+# ---------------------------
+
+def main():
+    # 1. Check input files
     for file_path in [INPUT_FILE, AGENDA_FILE]:
         if not os.path.exists(file_path):
             print(f"❌ Required file not found: {file_path}")
@@ -177,7 +456,7 @@ def main():
             if requirement_content:
                 print(f"  ✓ Loaded requirements from {REQUIREMENT_FILE}")
 
-    # 3. Build system prompt
+    # 2. Build system prompt
     system_content = f"""
 CRITICAL RULES (NON-NEGOTIABLE):
 
@@ -187,6 +466,9 @@ CRITICAL RULES (NON-NEGOTIABLE):
 4. Prepare Step is OPTIONAL:
    - If no preparation is required, leave the cell EMPTY.
    - Do NOT use N/A, None, -, or placeholders.
+5. Output exactly one row per input test case.
+   - TC ID MUST echo the input test case header exactly (e.g. TC7).
+   - This overrides the TC-XXX format in the agenda; IDs are renumbered afterwards.
 """
 
     system_content += "\n\n---\n\n# AGENDA\n\n" + agenda_content
@@ -194,37 +476,45 @@ CRITICAL RULES (NON-NEGOTIABLE):
     if requirement_content:
         system_content += "\n\n---\n\n# REQUIREMENTS\n\n" + requirement_content
 
-    # 4. Call OpenAI
-    print(f"🤖 Sending request to OpenAI ({MODEL_NAME})...")
-    response = client.chat.completions.create(
-        model=MODEL_NAME,
-        messages=[
-            {"role": "system", "content": system_content},
-            {"role": "user", "content": testcase_content}
-        ],
-        temperature=0.1
-    )
-
-    ai_output = response.choices[0].message.content
+    # 3. Route test cases to backends
+    blocks = parse_testcases(testcase_content)
+    routed = route_testcases(blocks)
 
-    # 5. Process AI output
-    print("🧹 Cleaning AI output...")
-    cleaned_output = clean_ai_output(ai_output)
+    backends = {kind: create_backend(kind) for kind in routed}
+    stats = {}
+    results = {}
 
-    # 6. Convert to DataFrame
+    # 4. Convert batches
     try:
-        lines = cleaned_output.splitlines()
-        first_row = lines[0].split("\t")
-
-        if first_row == EXPECTED_COLUMNS:
-            df = pd.read_csv(io.StringIO(cleaned_output), sep="\t")
-        else:
-            df = pd.read_csv(
-                io.StringIO(cleaned_output),
-                sep="\t",
-                header=None,
-                names=EXPECTED_COLUMNS
-            )
+        for kind, kind_blocks in routed.items():
+            backend = backends[kind]
+            s = stats.setdefault(backend.name, {
+                "model": backend.model, "calls": 0, "testcases": 0, "seconds": 0.0
+            })
+
+            for start in range(0, len(kind_blocks), BATCH_SIZE):
+                batch = kind_blocks[start:start + BATCH_SIZE]
+                print(f"🤖 Converting {len(batch)} TC with {backend.name} ({backend.model})...")
+
+                started = time.perf_counter()
+                try:
+                    df = backend.convert(batch, system_content)
+                except (APIError, ConnectionError) as e:
+                    # Endpoint down, auth or rate limit: not an output problem
+                    print(f"❌ Request to {backend.name} ({backend.model}) failed:")
+                    print(e)
+                    sys.exit(1)
+                s["seconds"] += time.perf_counter() - started
+                s["calls"] += 1
+                s["testcases"] += len(batch)
+
+                for _, row in df.iterrows():
+                    results[row["TC ID"]] = row
+
+        # 5. Merge in original TC order, then renumber to TC-XXX
+        df = pd.DataFrame([results[b["id"]] for b in blocks], columns=EXPECTED_COLUMNS)
+        df = df.reset_index(drop=True)
+        df["TC ID"] = [f"TC-{i:03d}" for i in range(1, len(df) + 1)]
 
         df = normalize_multiline_columns(df)
         df = normalize_prepare_step(df)
@@ -233,14 +523,13 @@ CRITICAL RULES (NON-NEGOTIABLE):
     except Exception as e:
         print("❌ Validation failed:")
         print(e)
-        print("\n--- RAW AI OUTPUT ---\n")
-        print(cleaned_output)
         sys.exit(1)
 
-    # 7. Save to Excel
+    # 6. Save to Excel
     df.to_excel(OUTPUT_FILE, index=False)
     post_process_excel(OUTPUT_FILE)
 
+    print_backend_stats(stats)
     print(f"✅ Success! Test cases saved to '{OUTPUT_FILE}'.")
 
 
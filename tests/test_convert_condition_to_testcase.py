@@ -0,0 +1,257 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import openai
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import convert_condition_to_testcase as convert
+from convert_condition_to_testcase import (
+    EXPECTED_COLUMNS,
+    TemplateBackend,
+    classify_testcase,
+    match_rows_to_blocks,
+    parse_testcases,
+    route_testcases,
+    validate_agenda_format,
+)
+
+TESTCASES = """TC1
+  - Email: v1 = Valid email
+  - Password: v2 = 8+ chars
+
+TC2
+  - Email: x1 = Blank
+  - Password: v2 = 8+ chars
+
+TC3
+  - Email: v1 = Valid email
+  - Password: x2 = Too short
+"""
+
+TEMPLATE_FIELDS = {
+    "Email": {"field": "email", "values": {"v1": "alice@test.com", "x1": '""'}},
+    "Password": {"field": "password", "values": {"v2": "Test1234", "x2": "Ab1"}},
+}
+
+
+def make_rows(tc_ids):
+    return pd.DataFrame(
+        [[tc_id] + [f"{tc_id} {col}" for col in EXPECTED_COLUMNS[1:]] for tc_id in tc_ids],
+        columns=EXPECTED_COLUMNS,
+    )
+
+
+class TestParseTestcases(unittest.TestCase):
+
+    def test_parses_blocks_and_items(self):
+        blocks = parse_testcases(TESTCASES)
+
+        self.assertEqual([b["id"] for b in blocks], ["TC1", "TC2", "TC3"])
+        self.assertEqual(blocks[1]["items"], [("Email", "x1", "Blank"), ("Password", "v2", "8+ chars")])
+        self.assertEqual(blocks[2]["text"], "TC3\n  - Email: v1 = Valid email\n  - Password: x2 = Too short")
+
+    def test_multiline_description(self):
+        blocks = parse_testcases("TC1\n  - Email: v1 = line 1\nline 2\n  - Password: v2 = a: b = c\n")
+
+        self.assertEqual(blocks[0]["items"], [
+            ("Email", "v1", "line 1\nline 2"),
+            ("Password", "v2", "a: b = c"),
+        ])
+
+    def test_blank_line_inside_description(self):
+        content = "TC1\n  - Email: v1 = first\n\nsecond\n\nTC2\n  - Email: x1 = Blank\n"
+
+        blocks = parse_testcases(content)
+
+        self.assertEqual([b["id"] for b in blocks], ["TC1", "TC2"])
+        self.assertEqual(blocks[0]["items"], [("Email", "v1", "first\n\nsecond")])
+        self.assertEqual(blocks[1]["items"], [("Email", "x1", "Blank")])
+
+
+class TestRouting(unittest.TestCase):
+
+    def test_classify_testcase(self):
+        blocks = parse_testcases(TESTCASES)
+
+        self.assertEqual([classify_testcase(b) for b in blocks], ["valid", "invalid", "invalid"])
+
+    def test_route_testcases(self):
+        blocks = parse_testcases(TESTCASES)
+
+        with mock.patch.object(convert, "ROUTING", {"valid": "openai", "invalid": "template"}):
+            routed = route_testcases(blocks)
+
+        self.assertEqual({k: [b["id"] for b in v] for k, v in routed.items()}, {
+            "openai": ["TC1"],
+            "template": ["TC2", "TC3"],
+        })
+
+
+class TestMatchRowsToBlocks(unittest.TestCase):
+
+    def setUp(self):
+        self.blocks = parse_testcases(TESTCASES)
+
+    def test_matches_by_id_not_position(self):
+        df = match_rows_to_blocks(make_rows(["TC3", "TC1", "TC2"]), self.blocks)
+
+        self.assertEqual(list(df["TC ID"]), ["TC1", "TC2", "TC3"])
+        self.assertEqual(list(df["Test Case Name"]), ["TC1 Test Case Name", "TC2 Test Case Name", "TC3 Test Case Name"])
+
+    def test_normalizes_id_format(self):
+        blocks = parse_testcases("TC7\n  - Email: v1 = ok\n\nTC8\n  - Email: x1 = Blank\n")
+
+        df = match_rows_to_blocks(make_rows(["TC-007", " TC008 "]), blocks)
+
+        self.assertEqual(list(df["TC ID"]), ["TC7", "TC8"])
+        self.assertEqual(df.loc[0, "Test Case Name"], "TC-007 Test Case Name")
+
+    def test_rejects_duplicate_id(self):
+        with self.assertRaisesRegex(ValueError, "Duplicate TC ID"):
+            match_rows_to_blocks(make_rows(["TC1", "TC2", "TC-002"]), self.blocks)
+
+    def test_rejects_missing_id(self):
+        with self.assertRaisesRegex(ValueError, "Missing test cases in AI output: TC3"):
+            match_rows_to_blocks(make_rows(["TC1", "TC2"]), self.blocks)
+
+    def test_rejects_unexpected_id(self):
+        with self.assertRaisesRegex(ValueError, "Unexpected TC ID in AI output: TC4"):
+            match_rows_to_blocks(make_rows(["TC1", "TC2", "TC3", "TC4"]), self.blocks)
+
+
+class TestTemplateBackend(unittest.TestCase):
+
+    def setUp(self):
+        for name, value in [
+            ("TEMPLATE_METHOD", "POST"),
+            ("TEMPLATE_ENDPOINT", "/api/register"),
+            ("TEMPLATE_FIELDS", TEMPLATE_FIELDS),
+        ]:
+            patcher = mock.patch.object(convert, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.invalid_blocks = parse_testcases(TESTCASES)[1:]
+
+    def test_renders_invalid_testcases(self):
+        df = TemplateBackend().convert(self.invalid_blocks, "")
+
+        self.assertEqual(list(df.columns), EXPECTED_COLUMNS)
+        row = df.iloc[1]
+        self.assertEqual(row["TC ID"], "TC3")
+        self.assertEqual(row["Test Data"], "email: alice@test.com | password: Ab1")
+        self.assertEqual(
+            row["Test Steps"],
+            "1. Send POST request to /api/register with email=alice@test.com and password=Ab1"
+            " | 2. Receive API response",
+        )
+        self.assertEqual(row["Test Case Name"], "POST /api/register fails when password is invalid (Too short)")
+        self.assertEqual(row["Expected Result"], "API returns 400 Bad Request with validation error message for password")
+        self.assertEqual(df.iloc[0]["Test Data"], 'email: "" | password: Test1234')
+
+    def test_invalid_value_wins_for_shared_field(self):
+        fields = {
+            "First char": {"field": "username", "values": {"v1": "Alice", "x1": "alice"}},
+            "Allowed chars": {"field": "username", "values": {"v2": "Alice", "x2": "Al!ce"}},
+        }
+        blocks = parse_testcases("TC1\n  - First char: v1 = Upper\n  - Allowed chars: x2 = Symbol\n")
+
+        with mock.patch.object(convert, "TEMPLATE_FIELDS", fields):
+            df = TemplateBackend().convert(blocks, "")
+
+        self.assertEqual(df.iloc[0]["Test Data"], "username: Al!ce")
+
+    def test_missing_template_value_raises(self):
+        fields = {"Email": TEMPLATE_FIELDS["Email"]}
+
+        with mock.patch.object(convert, "TEMPLATE_FIELDS", fields):
+            with self.assertRaisesRegex(ValueError, "TEMPLATE_FIELDS has no value for 'Password' tag 'v2'"):
+                TemplateBackend().convert(self.invalid_blocks, "")
+
+    def test_rejects_valid_testcase(self):
+        valid_block = parse_testcases(TESTCASES)[:1]
+
+        with self.assertRaisesRegex(ValueError, "single-invalid TCs only: TC1"):
+            TemplateBackend().convert(valid_block, "")
+
+    def test_agenda_format_rejects_non_conforming_rows(self):
+        df = TemplateBackend().convert(self.invalid_blocks, "")
+
+        cases = [
+            ("Test Data", "Email Address: Blank", "Test Data breaks agenda format"),
+            ("Test Data", "email: <email>", "Test Data breaks agenda format"),
+            ("Test Steps", "1. Send API request with test data", "HTTP method and endpoint"),
+            ("Test Steps", "1. Send POST request to /api/register with test data", "actual values"),
+            ("Expected Result", "API rejects the request", "HTTP status code"),
+        ]
+        for column, value, message in cases:
+            broken = df.copy()
+            broken.loc[0, column] = value
+            with self.subTest(column=column, value=value):
+                with self.assertRaisesRegex(ValueError, message):
+                    validate_agenda_format(broken)
+
+
+class FailingBackend:
+    name = "local"
+    model = "llama3.1"
+
+    def __init__(self, error):
+        self.error = error
+
+    def convert(self, blocks, system_content):
+        raise self.error
+
+
+class TestMainErrors(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        input_file = os.path.join(tmp.name, "testcase.txt")
+        agenda_file = os.path.join(tmp.name, "agend.md")
+        with open(input_file, "w", encoding="utf-8") as f:
+            f.write(TESTCASES)
+        with open(agenda_file, "w", encoding="utf-8") as f:
+            f.write("# Agenda")
+
+        for name, value in [
+            ("INPUT_FILE", input_file),
+            ("AGENDA_FILE", agenda_file),
+            ("REQUIREMENT_FILE", ""),
+            ("OUTPUT_FILE", os.path.join(tmp.name, "testcase.xlsx")),
+        ]:
+            patcher = mock.patch.object(convert, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def run_main(self, error):
+        output = io.StringIO()
+        with mock.patch.object(convert, "create_backend", lambda kind: FailingBackend(error)):
+            with redirect_stdout(output), self.assertRaises(SystemExit) as cm:
+                convert.main()
+        self.assertEqual(cm.exception.code, 1)
+        return output.getvalue()
+
+    def test_api_error_names_backend(self):
+        output = self.run_main(openai.APIConnectionError(request=mock.Mock()))
+
+        self.assertIn("❌ Request to local (llama3.1) failed:", output)
+        self.assertNotIn("Validation failed", output)
+
+    def test_value_error_reports_validation_failed(self):
+        output = self.run_main(ValueError("Missing test cases in AI output: TC3"))
+
+        self.assertIn("❌ Validation failed:", output)
+        self.assertIn("Missing test cases in AI output: TC3", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import os
+import random
+import sys
+import time
+import tracemalloc
+import unittest
+from collections import OrderedDict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from EP_generate import build_matrix, generate_ep_testcases
+
+RANDOM_SPECS = 300
+
+# Stress limits. Measured locally: generate at 200 conditions x (50 valid +
+# 50 invalid) ~0.02s / 8 MB peak; build_matrix is dense (tags x TCs), so it
+# runs at 50 x (20 + 20) ~0.02s / 7 MB. Limits leave headroom for slow CI.
+GENERATE_STRESS = (200, 50)
+GENERATE_MAX_SECONDS = 0.5
+GENERATE_MAX_PEAK_MB = 32
+MATRIX_STRESS = (50, 20)
+MATRIX_MAX_SECONDS = 0.5
+MATRIX_MAX_PEAK_MB = 32
+
+
+def make_conditions(rng, n_conds, max_valid, max_invalid, min_valid=1):
+    conditions = OrderedDict()
+    for ci in range(n_conds):
+        n_valid = rng.randint(min_valid, max_valid)
+        n_invalid = rng.randint(0, max_invalid)
+        conditions[f"Condition {ci}"] = {
+            "valid": OrderedDict((f"v{ci}_{j}", f"valid {ci}.{j}") for j in range(n_valid)),
+            "invalid": OrderedDict((f"x{ci}_{j}", f"invalid {ci}.{j}") for j in range(n_invalid)),
+        }
+    return conditions
+
+
+class EPInvariantsMixin:
+
+    def assert_ep_invariants(self, conditions, tcs):
+        """
+        EP rules:
+        - every TC has one tag per condition, taken from that condition
+        - every valid tag is covered by at least one all-valid TC
+        - every invalid tag appears in exactly one TC
+        - a TC never holds more than one invalid tag
+        """
+        conds = list(conditions.keys())
+        valid_covered = set()
+        invalid_seen = {}
+
+        for i, tc in enumerate(tcs, start=1):
+            self.assertEqual(len(tc), len(conds), f"TC{i} tag count")
+
+            invalid_in_tc = []
+            for cond, tag in zip(conds, tc):
+                if tag in conditions[cond]["invalid"]:
+                    invalid_in_tc.append((cond, tag))
+                else:
+                    self.assertIn(tag, conditions[cond]["valid"], f"TC{i}: '{tag}' not in '{cond}'")
+
+            self.assertLessEqual(len(invalid_in_tc), 1, f"TC{i} has more than one invalid tag")
+
+            if invalid_in_tc:
+                key = invalid_in_tc[0]
+                invalid_seen[key] = invalid_seen.get(key, 0) + 1
+            else:
+                valid_covered.update(zip(conds, tc))
+
+        for cond in conds:
+            for tag in conditions[cond]["valid"]:
+                self.assertIn((cond, tag), valid_covered, f"valid tag '{tag}' not covered")
+            for tag in conditions[cond]["invalid"]:
+                self.assertEqual(invalid_seen.get((cond, tag), 0), 1, f"invalid tag '{tag}'")
+
+
+class TestGenerateEPTestcases(EPInvariantsMixin, unittest.TestCase):
+
+    def test_random_specs_keep_ep_invariants(self):
+        rng = random.Random(20261019)
+        for _ in range(RANDOM_SPECS):
+            conditions = make_conditions(rng, rng.randint(1, 10), 6, 6)
+            tcs = generate_ep_testcases(conditions)
+            self.assert_ep_invariants(conditions, tcs)
+
+            valid_count = max(len(c["valid"]) for c in conditions.values())
+            invalid_count = sum(len(c["invalid"]) for c in conditions.values())
+            self.assertEqual(len(tcs), valid_count + invalid_count)
+
+    def test_random_specs_build_matrix(self):
+        rng = random.Random(7)
+        for _ in range(RANDOM_SPECS):
+            conditions = make_conditions(rng, rng.randint(1, 10), 6, 6)
+            tcs = generate_ep_testcases(conditions)
+            matrix, tag_to_cond = build_matrix(conditions, tcs)
+
+            for i, tc in enumerate(tcs):
+                marked = [tag for tag, row in matrix.items() if row[i] == "X"]
+                self.assertEqual(sorted(marked), sorted(tc))
+            for cond, data in conditions.items():
+                for tag in list(data["valid"]) + list(data["invalid"]):
+                    self.assertEqual(tag_to_cond[tag], cond)
+
+    def test_empty_spec_returns_no_testcases(self):
+        self.assertEqual(generate_ep_testcases(OrderedDict()), [])
+
+    def test_condition_without_valid_tags_raises(self):
+        rng = random.Random(3)
+        for _ in range(50):
+            conditions = make_conditions(rng, rng.randint(1, 6), 4, 4)
+            empty = rng.choice(list(conditions.keys()))
+            conditions[empty]["valid"] = OrderedDict()
+            with self.assertRaisesRegex(ValueError, empty):
+                generate_ep_testcases(conditions)
+
+
+class TestGenerateEPTestcasesStress(EPInvariantsMixin, unittest.TestCase):
+
+    def make_stress_conditions(self, size):
+        n_conds, n_tags = size
+        return make_conditions(random.Random(0), n_conds, n_tags, n_tags, min_valid=n_tags)
+
+    def measure(self, func):
+        tracemalloc.start()
+        try:
+            started = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return result, elapsed, peak / (1024 * 1024)
+
+    def test_stress_generate(self):
+        conditions = self.make_stress_conditions(GENERATE_STRESS)
+
+        tcs, elapsed, peak_mb = self.measure(lambda: generate_ep_testcases(conditions))
+
+        self.assertLess(elapsed, GENERATE_MAX_SECONDS)
+        self.assertLess(peak_mb, GENERATE_MAX_PEAK_MB)
+        self.assert_ep_invariants(conditions, tcs)
+
+    def test_stress_build_matrix(self):
+        conditions = self.make_stress_conditions(MATRIX_STRESS)
+        tcs = generate_ep_testcases(conditions)
+
+        _, elapsed, peak_mb = self.measure(lambda: build_matrix(conditions, tcs))
+
+        self.assertLess(elapsed, MATRIX_MAX_SECONDS)
+        self.assertLess(peak_mb, MATRIX_MAX_PEAK_MB)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,189 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+import urllib.request
+from unittest import mock
+
+from openpyxl import Workbook
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import EP_generate
+from EP_generate import LiveReloadHandler, read_conditions, start_live_reload_server, watch_workbook
+
+WATCH_INTERVAL = 0.02
+WATCH_DEBOUNCE = 0.1
+WAIT_TIMEOUT = 5.0
+
+SHEET_V1 = [
+    ("Email", "Valid email", "v1", "Blank", "x1"),
+    (None, None, None, "No @", "x2"),
+    ("Password", "8+ chars", "v2", "Too short", "x3"),
+]
+SHEET_V2 = SHEET_V1 + [("Name", "Alphabet", "v3", "Digits", "x4")]
+SHEET_NO_VALID = [("Email", None, None, "Blank", "x1")]
+
+
+def save_workbook(path, sheets):
+    """
+    Save {sheet name: rows} as EP workbook (header row + condition rows).
+    """
+    wb = Workbook()
+    wb.remove(wb.active)
+    for name, rows in sheets.items():
+        ws = wb.create_sheet(name)
+        ws.append(["Condition", "Valid", "Tag", "Invalid", "Tag"])
+        for row in rows:
+            ws.append(list(row))
+    wb.save(path)
+
+
+class TestReadConditionsReadOnly(unittest.TestCase):
+
+    def test_read_only_reads_selected_sheet(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ep.xlsx")
+            save_workbook(path, {"Main": SHEET_V1, "Other": SHEET_V2})
+
+            conditions = read_conditions(path, "Main", read_only=True)
+
+            self.assertEqual(list(conditions), ["Email", "Password"])
+            self.assertEqual(dict(conditions["Email"]["invalid"]), {"x1": "Blank", "x2": "No @"})
+            self.assertEqual(conditions, read_conditions(path, "Main"))
+
+
+class TestWatchWorkbook(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "ep.xlsx")
+        self.output_txt = os.path.join(tmp.name, "testcase.txt")
+
+        for name, value in [
+            ("WATCH_INTERVAL", WATCH_INTERVAL),
+            ("WATCH_DEBOUNCE", WATCH_DEBOUNCE),
+            ("OUTPUT_TXT", self.output_txt),
+            ("OUTPUT_HTML", os.path.join(tmp.name, "ep_matrix.html")),
+        ]:
+            patcher = mock.patch.object(EP_generate, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        print_patcher = mock.patch("builtins.print")
+        self.print_mock = print_patcher.start()
+        self.addCleanup(print_patcher.stop)
+
+        save_workbook(self.path, {"Main": SHEET_V1, "Other": SHEET_V1})
+        self.start_version = LiveReloadHandler.version
+
+    def start_watch(self, live_reload=False):
+        conditions = read_conditions(self.path, "Main", read_only=True)
+        stop_event = threading.Event()
+        thread = threading.Thread(
+            target=watch_workbook,
+            args=(self.path, "Main", conditions, live_reload, stop_event),
+            daemon=True,
+        )
+        thread.start()
+        self.addCleanup(thread.join, WAIT_TIMEOUT)
+        self.addCleanup(stop_event.set)
+        # Let the watcher take its first snapshot
+        time.sleep(WATCH_INTERVAL * 3)
+
+    def regenerations(self):
+        return LiveReloadHandler.version - self.start_version
+
+    def wait_for_regenerations(self, count):
+        deadline = time.monotonic() + WAIT_TIMEOUT
+        while self.regenerations() < count and time.monotonic() < deadline:
+            time.sleep(WATCH_INTERVAL)
+        self.assertEqual(self.regenerations(), count)
+
+    def settle(self):
+        # Long enough for any pending change to pass the debounce
+        time.sleep(WATCH_DEBOUNCE + WATCH_INTERVAL * 10)
+
+    def printed(self, text):
+        return [c for c in self.print_mock.call_args_list if c.args and text in str(c.args[0])]
+
+    def test_regenerates_after_save(self):
+        self.start_watch()
+
+        save_workbook(self.path, {"Main": SHEET_V2, "Other": SHEET_V1})
+
+        self.wait_for_regenerations(1)
+        with open(self.output_txt, encoding="utf-8") as f:
+            self.assertIn("Name: x4 = Digits", f.read())
+
+    def test_debounces_rapid_saves(self):
+        self.start_watch()
+
+        # Saves closer together than WATCH_DEBOUNCE are handled once
+        for rows in (SHEET_V2, SHEET_V1, SHEET_V2):
+            save_workbook(self.path, {"Main": rows, "Other": SHEET_V1})
+            time.sleep(WATCH_DEBOUNCE / 4)
+
+        self.wait_for_regenerations(1)
+        self.settle()
+        self.assertEqual(self.regenerations(), 1)
+
+    def test_skips_when_selected_sheet_unchanged(self):
+        self.start_watch()
+
+        save_workbook(self.path, {"Main": SHEET_V1, "Other": SHEET_V2})
+
+        self.settle()
+        self.assertEqual(self.regenerations(), 0)
+        self.assertFalse(os.path.exists(self.output_txt))
+
+    def test_recovers_after_read_failure(self):
+        self.start_watch()
+
+        with open(self.path, "wb") as f:
+            f.write(b"half-written workbook")
+        self.settle()
+        self.settle()
+
+        # Failed version is not re-read on every poll
+        self.assertEqual(len(self.printed("Cannot read sheet")), 1)
+        self.assertEqual(self.regenerations(), 0)
+
+        save_workbook(self.path, {"Main": SHEET_V2, "Other": SHEET_V1})
+        self.wait_for_regenerations(1)
+
+    def test_reports_invalid_sheet_and_keeps_watching(self):
+        self.start_watch()
+
+        save_workbook(self.path, {"Main": SHEET_NO_VALID, "Other": SHEET_V1})
+        self.settle()
+        self.assertEqual(len(self.printed("[WATCH] Error")), 1)
+        self.assertEqual(self.regenerations(), 0)
+
+        save_workbook(self.path, {"Main": SHEET_V2, "Other": SHEET_V1})
+        self.wait_for_regenerations(1)
+
+    def test_live_reload_version_increases(self):
+        server = start_live_reload_server(port=0)
+        self.assertIsNotNone(server)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = f"http://127.0.0.1:{server.server_address[1]}/__version"
+
+        def fetch_version():
+            with urllib.request.urlopen(url) as response:
+                return int(response.read())
+
+        before = fetch_version()
+        self.start_watch(live_reload=True)
+        save_workbook(self.path, {"Main": SHEET_V2, "Other": SHEET_V1})
+        self.wait_for_regenerations(1)
+
+        self.assertEqual(fetch_version(), before + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()